@@ -1,4 +1,7 @@
 import re
+from typing import Optional
+
+import inkex
 
 rgx_float = r"[-+]?(\d+([.,]\d*)?|[.,]\d+)([eE][-+]?\d+)?"
 rgx_name = "[a-z,_]*"
@@ -8,13 +11,63 @@ optics_pattern = re.compile(
 )
 
 
+# Namespaced tag of the description elements, computed once
+_DESC_TAG = inkex.addNS("desc", "svg")
+
+
+def get_description(obj: inkex.BaseElement) -> Optional[str]:
+    """
+    Returns the description of an element, or None if it doesn't have one
+
+    Same as obj.desc, which translates the tag of the description for every
+    access.
+    """
+
+    desc = obj.find(_DESC_TAG)
+    return None if desc is None else desc.text
+
+
+def set_description(obj: inkex.BaseElement, text: str) -> None:
+    """
+    Sets the description of an element, adding one if it doesn't have any
+
+    Same as assigning obj.desc, which looks for the description with an
+    xpath query translated for every access.
+    """
+
+    desc = obj.find(_DESC_TAG)
+    if desc is None:
+        desc = inkex.Desc()
+        obj.insert(0, desc)
+    desc.text = text
+
+
+def may_contain_optics(string_: str) -> bool:
+    """
+    Quick test rejecting the strings that can't contain an optical property
+
+    Most descriptions don't have any, and a substring search is much cheaper
+    than running the pattern. Case folding doesn't match all the characters
+    that the case insensitive pattern does (it matches "İ" and "ı" with "i"),
+    so the pattern is still run on the non ASCII strings that are rejected.
+    """
+
+    if "optics" in string_.casefold():
+        return True
+    return not string_.isascii() and optics_pattern.search(string_) is not None
+
+
 def get_optics_fields(string_: str):
-    fields = re.finditer(optics_pattern, string_)
+    if not may_contain_optics(string_):
+        return iter(())
+    fields = optics_pattern.finditer(string_)
     return fields
 
 
 def clear_description(desc: str) -> str:
     """Removes text corresponding to an optical property"""
 
-    new_desc = re.sub(optics_pattern, "", desc)
+    if not may_contain_optics(desc):
+        return desc
+    new_desc = optics_pattern.sub("", desc)
     return new_desc
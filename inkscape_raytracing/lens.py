@@ -1,9 +1,13 @@
 """
 Module to add a lens object in the document
 """
+from __future__ import annotations
+
 from math import cos, pi, sin, sqrt, acos, tan
+from typing import Final
 
 import inkex
+import numpy
 
 
 class Lens(inkex.GenerateExtension):
@@ -12,14 +16,18 @@ class Lens(inkex.GenerateExtension):
     from user parameters.
     """
 
-    @property
-    def style(self):
-        return {
+    style: Final = inkex.Style(
+        {
             "stroke": "#000000",
             "fill": "#b7c2dd",
             "stroke-linejoin": "round",
             "stroke-width": "0.5pt",
         }
+    )
+
+    # The lens is computed along the x axis and drawn vertically, by
+    # applying this rotation matrix of 90° to all the nodes at once
+    rotation: Final = numpy.array([[0.0, -1.0], [1.0, 0.0]])
 
     @staticmethod
     def add_arguments(pars):
@@ -36,12 +44,29 @@ class Lens(inkex.GenerateExtension):
 
         pars.add_argument("--lens_type", type=str, default="plano_con")
 
+    def __init__(self):
+        super().__init__()
+        # Length in document units of one unit of each already met unit
+        self._unit_scales: dict[str, float] = dict()
+
+    def to_document_units(self, value: float, unit: str) -> float:
+        """
+        Converts a length to the units of the document
+
+        The conversion is linear, so the string of the unit is only parsed
+        by inkex the first time it is met.
+        """
+
+        scale = self._unit_scales.get(unit)
+        if scale is None:
+            scale = self._unit_scales[unit] = self.svg.viewport_to_unit(f"1{unit}")
+        return value * scale
+
     def generate(self):
         opts = self.options
-        d = self.svg.viewport_to_unit(f"{opts.diameter}{opts.diameter_unit}")
-        f = self.svg.viewport_to_unit(f"{opts.focal_length}{opts.focal_length_unit}")
-        e = self.svg.viewport_to_unit(
-            f"{opts.edge_thickness}{opts.edge_thickness_unit}")
+        d = self.to_document_units(opts.diameter, opts.diameter_unit)
+        f = self.to_document_units(opts.focal_length, opts.focal_length_unit)
+        e = self.to_document_units(opts.edge_thickness, opts.edge_thickness_unit)
         optical_index = opts.optical_index
 
         lens_path = []
@@ -98,9 +123,11 @@ class Lens(inkex.GenerateExtension):
 
         lens = inkex.PathElement()
         lens.style = self.style
-        closed_path = inkex.Path(inkex.CubicSuperPath([lens_path]))
+        # Array of shape (n, 3, 2) with [handle_before, node, handle_after]
+        nodes = numpy.array(lens_path, dtype=numpy.float64) @ self.rotation.T
+        closed_path = inkex.Path(inkex.CubicSuperPath([nodes.tolist()]))
         closed_path.close()
-        lens.path = closed_path.transform(inkex.Transform("rotate(90)"))
+        lens.path = closed_path
         lens.desc = (
             f"L{opts.focal_length}{opts.focal_length_unit}\n"
             f"optics:glass:{optical_index:.4f}"
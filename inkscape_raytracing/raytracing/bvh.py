@@ -0,0 +1,137 @@
+"""
+Bounding volume hierarchy over the objects of a scene
+
+It is used to accelerate the search of the first object hit by a beam: the
+objects whose bounding box is not crossed by the beam, or only after a
+closer collision was found, are never tested.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from .geometry import AABBox, GeometricObject
+from .ray import Ray
+from .shade import NO_HIT, ShadeRec
+
+# Maximal number of objects stored in a leaf of the hierarchy
+MAX_LEAF_SIZE = 2
+
+
+@dataclass(frozen=True)
+class BVHNode:
+    """
+    Node of a bounding volume hierarchy
+
+    An inner node has two children and its bounding box encloses both of them.
+    A leaf has no children and stores the indices of its objects.
+    """
+
+    aabbox: AABBox
+    left: Optional[BVHNode] = None
+    right: Optional[BVHNode] = None
+    indices: tuple[int, ...] = ()
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.left is None
+
+    def first_hit(
+        self,
+        ray: Ray,
+        hit_object: Callable[[int, float], ShadeRec],
+        t_max: float = math.inf,
+    ) -> tuple[ShadeRec, Optional[int]]:
+        """
+        Finds the first collision of a beam with the objects of the hierarchy
+
+        hit_object(index, t_max) returns the shade of the collision of the
+        beam with the object of given index, ignoring the collisions after
+        t_max. Returns the shade of the first collision and the index of the
+        object hit, or None if no object is hit before t_max.
+        """
+
+        result, result_index = NO_HIT, None
+        stack = [(self.aabbox.entry_distance(ray), self)]
+        while stack:
+            entry_distance, node = stack.pop()
+            # Skip the nodes that can only be hit after the closest
+            # collision found so far
+            t_max = min(t_max, result.travel_dist)
+            if entry_distance >= t_max:
+                continue
+            if node.is_leaf:
+                for index in node.indices:
+                    shade = hit_object(index, min(t_max, result.travel_dist))
+                    if Ray.min_travel < shade.travel_dist < result.travel_dist:
+                        result, result_index = shade, index
+            else:
+                # The child entered first by the beam is visited first,
+                # as it is the most likely to give a close collision
+                near = (node.left.aabbox.entry_distance(ray), node.left)
+                far = (node.right.aabbox.entry_distance(ray), node.right)
+                if far[0] < near[0]:
+                    near, far = far, near
+                stack.append(far)
+                stack.append(near)
+        return result, result_index
+
+    def entered_leaves(self, ray: Ray, t_max: float = math.inf) -> list[int]:
+        """
+        Returns the indices of the objects whose leaf is entered by the beam
+        before a travel distance t_max
+        """
+
+        indices = list()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.aabbox.entry_distance(ray) < t_max:
+                if node.is_leaf:
+                    indices.extend(node.indices)
+                else:
+                    stack.append(node.right)
+                    stack.append(node.left)
+        return indices
+
+
+def build_bvh(geometries: Sequence[GeometricObject]) -> Optional[BVHNode]:
+    """
+    Builds a bounding volume hierarchy over a list of geometries
+
+    The nodes are split recursively, at the median of the centers of the
+    bounding boxes along the longest axis of the node. The leaves refer to
+    the objects by their index in the list.
+    """
+
+    if len(geometries) == 0:
+        return None
+    boxes = [geometry.aabbox for geometry in geometries]
+    return _build_node(boxes, list(range(len(boxes))))
+
+
+def _build_node(boxes: Sequence[AABBox], indices: list[int]) -> BVHNode:
+    aabbox = AABBox.englobing(boxes[index] for index in indices)
+    if len(indices) <= MAX_LEAF_SIZE:
+        return BVHNode(aabbox, indices=tuple(indices))
+
+    width = aabbox.upper_right.x - aabbox.lower_left.x
+    height = aabbox.upper_right.y - aabbox.lower_left.y
+    if width >= height:
+
+        def center(index):
+            return boxes[index].lower_left.x + boxes[index].upper_right.x
+
+    else:
+
+        def center(index):
+            return boxes[index].lower_left.y + boxes[index].upper_right.y
+
+    indices = sorted(indices, key=center)
+    median = len(indices) // 2
+    return BVHNode(
+        aabbox,
+        left=_build_node(boxes, indices[:median]),
+        right=_build_node(boxes, indices[median:]),
+    )
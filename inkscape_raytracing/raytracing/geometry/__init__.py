@@ -1,2 +1,3 @@
-from .cubic_bezier import CubicBezier
+from .cubic_bezier import CubicBezier, CubicBezierPath, CompositeCubicBezier
 from .geometric_object import GeometricObject, CompoundGeometricObject, AABBox
+from .rectangle import AxisAlignedRectangle
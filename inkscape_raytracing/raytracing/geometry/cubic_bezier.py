@@ -5,16 +5,26 @@ Module for handling objects composed of cubic bezier curves
 from __future__ import annotations
 
 import math
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from functools import cached_property
+from operator import itemgetter
+from typing import ClassVar, TypeVar
 
 import numpy
 
-from .geometric_object import AABBox, GeometricObject, GeometryError
+from .geometric_object import (
+    AABBox,
+    CompoundGeometricObject,
+    GeometricObject,
+    GeometryError,
+)
 from ..ray import Ray
-from ..shade import ShadeRec
+from ..shade import NO_HIT, ShadeRec
 from ..vector import Vector, UnitVector
 
+T = TypeVar("T", bound=GeometricObject)
+
 
 @dataclass(frozen=True)
 class CubicBezier(GeometricObject):
@@ -41,54 +51,92 @@ class CubicBezier(GeometricObject):
         object.__setattr__(self, "p3", p3)
 
     def eval(self, s) -> Vector:
-        return (
-            (1 - s) ** 3 * self.p0
-            + 3 * s * (1 - s) ** 2 * self.p1
-            + 3 * s ** 2 * (1 - s) * self.p2
-            + s ** 3 * self.p3
+        # Horner evaluation on floats of the monomial form
+        (cx0, cx1, cx2, cx3), (cy0, cy1, cy2, cy3) = self.monomial_coefficients
+        return Vector(
+            cx0 + s * (cx1 + s * (cx2 + s * cx3)),
+            cy0 + s * (cy1 + s * (cy2 + s * cy3)),
         )
 
     @cached_property
     def aabbox(self) -> AABBox:
+        # Box of the curve itself rather than of its control points, that can
+        # be much larger for curved segments and let more beams through to
+        # the computation of the intersections.
         # The box is slightly larger than the minimal box.
         # It prevents the box to have a zero dimension if the object is a line
         # aligned with vertical or horizontal.
-        lower_left = Vector(
-            min(self.p0.x, self.p1.x, self.p2.x, self.p3.x) - 1e-6,
-            min(self.p0.y, self.p1.y, self.p2.y, self.p3.y) - 1e-6,
-        )
-        upper_right = Vector(
-            max(self.p0.x, self.p1.x, self.p2.x, self.p3.x) + 1e-6,
-            max(self.p0.y, self.p1.y, self.p2.y, self.p3.y) + 1e-6,
-        )
+        cx, cy = self.monomial_coefficients
+        x_min, x_max = cubic_range(*cx)
+        y_min, y_max = cubic_range(*cy)
+        lower_left = Vector(x_min - 1e-6, y_min - 1e-6)
+        upper_right = Vector(x_max + 1e-6, y_max + 1e-6)
         return AABBox(lower_left, upper_right)
 
+    @cached_property
+    def monomial_coefficients(
+        self,
+    ) -> tuple[tuple[float, float, float, float], tuple[float, float, float, float]]:
+        r"""
+        Coefficients :math:`(c_0, c_1, c_2, c_3)` of the coordinates x and y
+        of the segment in the monomial basis
+
+        .. math::
+            \vec{X}(s) = \vec{c_0} + \vec{c_1} s + \vec{c_2} s^2 + \vec{c_3} s^3
+        """
+
+        def coefficients(x0, x1, x2, x3):
+            return (
+                x0,
+                3 * (x1 - x0),
+                3 * (x0 - 2 * x1 + x2),
+                -x0 + 3 * x1 - 3 * x2 + x3,
+            )
+
+        return (
+            coefficients(self.p0.x, self.p1.x, self.p2.x, self.p3.x),
+            coefficients(self.p0.y, self.p1.y, self.p2.y, self.p3.y),
+        )
+
+    @cached_property
+    def is_straight(self) -> bool:
+        """
+        True if the handles are on the end points, as for the segments of
+        lines, polylines and rectangles
+        """
+
+        p0, p1, p2, p3 = self.p0, self.p1, self.p2, self.p3
+        return p0.x == p1.x and p0.y == p1.y and p2.x == p3.x and p2.y == p3.y
+
     def tangent(self, s: float) -> UnitVector:
         """Returns the tangent at the curve at curvilinear coordinate s"""
 
-        diff_1 = (
-            -3 * (self.p0 - 3 * self.p1 + 3 * self.p2 - self.p3) * s ** 2
-            + 6 * (self.p0 - 2 * self.p1 + self.p2) * s
-            - 3 * (self.p0 - self.p1)
-        )
-        # If the first derivative is not zero, it is parallel to the tangent
-        if diff_1.norm() > 1e-8:
-            return diff_1.normalize()
-        # but is the first derivative is zero, we need to get the second order
-        else:
-            diff_2 = -6 * (self.p0 - 3 * self.p1 + 3 * self.p2 - self.p3) * s + 6 * (
-                self.p0 - 2 * self.p1 + self.p2
-            )
-            if diff_2.norm() > 1e-8:
-                return diff_2.normalize()
-            else:  # and even to the 3rd derivative if necessary
-                diff_3 = -6 * (self.p0 - 3 * self.p1 + 3 * self.p2 - self.p3)
-                return diff_3.normalize()
+        return UnitVector(*self._tangent_direction(s))
 
     def normal(self, s: float) -> UnitVector:
         """Returns a vector normal at the curve at curvilinear coordinate s"""
 
-        return self.tangent(s).orthogonal()
+        # Rotated before normalizing, so that the vector is only normalized once
+        dx, dy = self._tangent_direction(s)
+        return UnitVector(-dy, dx)
+
+    def _tangent_direction(self, s: float) -> tuple[float, float]:
+        """Non-zero vector tangent to the curve, not normalized"""
+
+        # The derivatives are evaluated on floats from the monomial
+        # coefficients, X'(s) = c1 + 2 c2 s + 3 c3 s^2
+        (__, cx1, cx2, cx3), (__, cy1, cy2, cy3) = self.monomial_coefficients
+        dx = cx1 + s * (2 * cx2 + s * 3 * cx3)
+        dy = cy1 + s * (2 * cy2 + s * 3 * cy3)
+        # If the first derivative is not zero, it is parallel to the tangent
+        if math.hypot(dx, dy) > 1e-8:
+            return dx, dy
+        # but is the first derivative is zero, we need to get the second order
+        dx, dy = 2 * cx2 + 6 * cx3 * s, 2 * cy2 + 6 * cy3 * s
+        if math.hypot(dx, dy) > 1e-8:
+            return dx, dy
+        else:  # and even to the 3rd derivative if necessary
+            return 6 * cx3, 6 * cy3
 
     def intersection_beam(self, ray: Ray) -> list[tuple[float, float]]:
         r"""
@@ -104,19 +152,16 @@ class CubicBezier(GeometricObject):
         with :math:`0 \lq s \lq 1` and :math:`t >= 0`
         """
 
-        a = ray.direction.orthogonal()
-        a0 = a * (self.p0 - ray.origin)
-        a1 = -3 * a * (self.p0 - self.p1)
-        a2 = 3 * a * (self.p0 - 2 * self.p1 + self.p2)
-        a3 = a * (-self.p0 + 3 * self.p1 - 3 * self.p2 + self.p3)
-        roots = cubic_real_roots(a0, a1, a2, a3)
-        intersection_points = [self.eval(s) for s in roots]
-        travel = [(X - ray.origin) * ray.direction for X in intersection_points]
-
-        def valid_domain(s, t):
-            return 0 <= s <= 1 and t > Ray.min_travel
-
-        return [(s, t) for (s, t) in zip(roots, travel) if valid_domain(s, t)]
+        origin = ray.origin.x, ray.origin.y
+        direction = ray.direction.x, ray.direction.y
+        if self.is_straight:
+            return ray_straight_bezier_intersections(
+                origin,
+                direction,
+                (self.p0.x, self.p0.y),
+                (self.p3.x, self.p3.y),
+            )
+        return ray_bezier_intersections(origin, direction, *self.monomial_coefficients)
 
     def num_hits(self, ray: Ray) -> int:
         if self.aabbox.hit(ray):
@@ -124,29 +169,247 @@ class CubicBezier(GeometricObject):
         else:
             return 0
 
-    def hit(self, ray: Ray) -> ShadeRec:
+    def hit(self, ray: Ray, t_max: float = math.inf) -> ShadeRec:
         """
         Returns a shade with the information for the first intersection
         of a beam with the bezier segment
         """
 
-        shade = ShadeRec()  # default no hit
-        if self.aabbox.hit(ray):
-            intersect_params = self.intersection_beam(ray)
-            travel_dist = [t for (__, t) in intersect_params]
-            if len(travel_dist) > 0:  # otherwise error with np.argmin
-                shade.normal = True
-                first_hit = numpy.argmin(travel_dist)
-                shade.travel_dist = travel_dist[first_hit]
-                shade.local_hit_point = ray.origin + shade.travel_dist * ray.direction
-                shade.normal = self.normal(intersect_params[first_hit][0])
-                shade.set_normal_same_side(ray.origin)
+        shade = NO_HIT
+        # No need to solve for the intersections if the bounding box is
+        # entered further than t_max
+        if self.aabbox.entry_distance(ray) < t_max:
+            intersect_params = [
+                (s, t) for (s, t) in self.intersection_beam(ray) if t < t_max
+            ]
+            if len(intersect_params) > 0:
+                # At most three intersections: the builtin min is cheaper
+                # than converting them to an array for numpy.argmin
+                s, t = min(intersect_params, key=itemgetter(1))
+                shade = self.shade(ray, s, t)
+        return shade
+
+    def shade(self, ray: Ray, s: float, t: float) -> ShadeRec:
+        """
+        Returns a shade for the collision of a beam with the segment at the
+        curvilinear coordinate s, after a travel distance t
+        """
+
+        shade = ShadeRec()
+        shade.travel_dist = t
+        shade.local_hit_point = ray.point_at(t)
+        shade.normal = self.normal(s)
+        shade.set_normal_same_side(ray.origin)
         return shade
 
     def is_inside(self, ray: Ray) -> bool:
         raise GeometryError(f"Can't define an inside for {self}.")
 
 
+class CubicBezierCompound(CompoundGeometricObject[T], ABC):
+    """
+    Compound object whose leaves are all cubic bezier segments
+
+    The monomial coefficients of all the leaves are available as arrays, so
+    that the intersections with many segments can be computed at once.
+    """
+
+    # The segments are tested all at once when the beam enters the leaves of
+    # the hierarchy of at least this many of them. Below, testing them one
+    # by one is faster, in particular because the traversal of the hierarchy
+    # stops at the first box further than a collision.
+    min_batch_segments: ClassVar[int] = 32
+
+    @property
+    @abstractmethod
+    def monomial_coefficients(self) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Same as CubicBezier.monomial_coefficients for all the leaves, as two
+        arrays of shape (n, 4) for the coordinates x and y
+        """
+
+    def hit(self, ray: Ray, t_max: float = math.inf) -> ShadeRec:
+        if len(self.leaves) >= self.min_batch_segments:
+            candidates = self.bvh.entered_leaves(ray, t_max)
+            if len(candidates) >= self.min_batch_segments:
+                result = self._first_segment_hit_many(
+                    ray, numpy.array(candidates), t_max
+                )
+                if result is not NO_HIT:
+                    result.hit_geometry = self
+                return result
+        return super().hit(ray, t_max)
+
+    def _first_segment_hit_many(
+        self, ray: Ray, candidates: numpy.ndarray, t_max: float
+    ) -> ShadeRec:
+        """
+        Finds the first intersection with the candidate leaves, all the
+        intersections being computed at once
+        """
+
+        cx, cy = self.monomial_coefficients
+        s, t = ray_bezier_intersections_many(
+            (ray.origin.x, ray.origin.y),
+            (ray.direction.x, ray.direction.y),
+            cx[candidates],
+            cy[candidates],
+        )
+        first_hit = numpy.unravel_index(numpy.argmin(t), t.shape)
+        if t[first_hit] < t_max:
+            segment = self.leaves[candidates[first_hit[0]]]
+            return segment.shade(ray, float(s[first_hit]), float(t[first_hit]))
+        else:
+            return NO_HIT
+
+
+@dataclass(frozen=True, eq=False)
+class CubicBezierPath(CubicBezierCompound[CubicBezier]):
+    """
+    Path made of consecutive cubic bezier segments
+
+    The control points of all the segments are also kept in a single array of
+    shape (n, 4, 2), with the points p0, p1, p2, p3 of each segment.
+    """
+
+    control_points: numpy.ndarray
+
+    def __init__(self, control_points):
+        control_points = numpy.asarray(control_points, dtype=numpy.float64)
+        super().__init__(
+            CubicBezier(*(Vector(x, y) for x, y in segment))
+            for segment in control_points.tolist()
+        )
+        object.__setattr__(self, "control_points", control_points)
+
+    @cached_property
+    def monomial_coefficients(self) -> tuple[numpy.ndarray, numpy.ndarray]:
+        p0, p1, p2, p3 = numpy.moveaxis(self.control_points, 1, 0)
+        coefficients = numpy.stack(
+            (p0, 3 * (p1 - p0), 3 * (p0 - 2 * p1 + p2), -p0 + 3 * p1 - 3 * p2 + p3),
+            axis=1,
+        )
+        return coefficients[..., 0], coefficients[..., 1]
+
+
+@dataclass(frozen=True, eq=False)
+class CompositeCubicBezier(CubicBezierCompound[CubicBezierPath]):
+    """Object made of several paths of cubic bezier segments"""
+
+    @cached_property
+    def monomial_coefficients(self) -> tuple[numpy.ndarray, numpy.ndarray]:
+        # The leaves are the segments of all the paths, in order
+        cx, cy = zip(*(path.monomial_coefficients for path in self.sub_objects))
+        return numpy.concatenate(cx), numpy.concatenate(cy)
+
+
+def ray_bezier_intersections(
+    origin: tuple[float, float],
+    direction: tuple[float, float],
+    cx: tuple[float, float, float, float],
+    cy: tuple[float, float, float, float],
+) -> list[tuple[float, float]]:
+    """
+    Computes the intersections between a ray and a cubic bezier segment
+
+    Same as CubicBezier.intersection_beam, but only operates on floats: the
+    ray is given by the coordinates of its origin and of its unit direction
+    and the segment by its monomial coefficients (see
+    CubicBezier.monomial_coefficients).
+    """
+
+    ox, oy = origin
+    dx, dy = direction
+    cx0, cx1, cx2, cx3 = cx
+    cy0, cy1, cy2, cy3 = cy
+    # relative to the ray origin
+    cx0, cy0 = cx0 - ox, cy0 - oy
+
+    # The intersections are on the ray, so they have no component along
+    # the normal to the ray (-dy, dx)
+    roots = cubic_real_roots(
+        dx * cy0 - dy * cx0,
+        dx * cy1 - dy * cx1,
+        dx * cy2 - dy * cx2,
+        dx * cy3 - dy * cx3,
+    )
+
+    intersections = list()
+    for s in roots:
+        if 0 <= s <= 1:
+            x = cx0 + s * (cx1 + s * (cx2 + s * cx3))
+            y = cy0 + s * (cy1 + s * (cy2 + s * cy3))
+            t = x * dx + y * dy
+            if t > Ray.min_travel:
+                intersections.append((s, t))
+    return intersections
+
+
+def ray_straight_bezier_intersections(
+    origin: tuple[float, float],
+    direction: tuple[float, float],
+    p0: tuple[float, float],
+    p3: tuple[float, float],
+) -> list[tuple[float, float]]:
+    """
+    Same as ray_bezier_intersections for a segment whose handles are on its
+    end points p0 and p3
+
+    The segment is a straight line, so its intersection is found from a
+    linear equation instead of the roots of a cubic.
+    """
+
+    ox, oy = origin
+    dx, dy = direction
+    ex, ey = p3[0] - p0[0], p3[1] - p0[1]
+    wx, wy = p0[0] - ox, p0[1] - oy
+    # Fraction u of the way from p0 to p3 where the segment crosses the ray
+    cross = dx * ey - dy * ex
+    if is_almost_zero(cross):  # parallel to the ray
+        return []
+    u = -(dx * wy - dy * wx) / cross
+    if not 0 <= u <= 1:
+        return []
+    t = (wx + u * ex) * dx + (wy + u * ey) * dy
+    if t <= Ray.min_travel:
+        return []
+    # The curve goes along the line as u = 3 s^2 - 2 s^3, inverted in closed form
+    s = 0.5 - math.sin(math.asin(1 - 2 * u) / 3)
+    return [(s, t)]
+
+
+def ray_bezier_intersections_many(
+    origin: tuple[float, float],
+    direction: tuple[float, float],
+    cx: numpy.ndarray,
+    cy: numpy.ndarray,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Same as ray_bezier_intersections for n segments at once
+
+    The monomial coefficients of the segments are given as arrays of shape
+    (n, 4). Returns two arrays of shape (n, 3) with the coordinates s and the
+    distances t of the intersections of each segment. The entries without an
+    intersection have an infinite distance.
+    """
+
+    ox, oy = origin
+    dx, dy = direction
+    # relative to the ray origin
+    cx = cx - numpy.array([ox, 0, 0, 0])
+    cy = cy - numpy.array([oy, 0, 0, 0])
+
+    # Same as in ray_bezier_intersections, for all the segments
+    normal_coefficients = dx * cy - dy * cx
+    s = cubic_real_roots_many(*normal_coefficients.T)
+    x = cx[:, [0]] + s * (cx[:, [1]] + s * (cx[:, [2]] + s * cx[:, [3]]))
+    y = cy[:, [0]] + s * (cy[:, [1]] + s * (cy[:, [2]] + s * cy[:, [3]]))
+    t = x * dx + y * dy
+    # nan for missing roots compares as False
+    valid = (0 <= s) & (s <= 1) & (t > Ray.min_travel)
+    return s, numpy.where(valid, t, math.inf)
+
+
 def cubic_real_roots(d: float, c: float, b: float, a: float) -> list[float]:
     """
     Returns the real roots X of a cubic polynomial defined as
@@ -159,44 +422,68 @@ def cubic_real_roots(d: float, c: float, b: float, a: float) -> list[float]:
     # https://en.wikipedia.org/wiki/Cubic_equation#General_cubic_formula
 
     if not is_almost_zero(a):  # true cubic equation
-        p = (3 * a * c - b ** 2) / 3 / a ** 2
-        q = (2 * b ** 3 - 9 * a * b * c + 27 * a ** 2 * d) / 27 / a ** 3
+        # Depressed cubic t^3 + p t + q = 0 with X = t - b / 3a, computed
+        # from the monic polynomial
+        b, c, d = b / a, c / a, d / a
+        p = c - b * b / 3
+        q = (2 * b * b - 9 * c) * b / 27 + d
         if is_almost_zero(p):
-            t = [numpy.cbrt(-q)]
+            t = [cbrt(-q)]
         else:
-            discr = -(4 * p ** 3 + 27 * q ** 2)
+            discr = -(4 * p ** 3 + 27 * q * q)
             if is_almost_zero(discr):
                 if is_almost_zero(q):
                     t = [0]
                 else:
                     t = [3 * q / p, -3 * q / 2 / p]
             elif discr < 0:
-                t = [
-                    numpy.cbrt(-q / 2 + numpy.sqrt(-discr / 108))
-                    + numpy.cbrt(-q / 2 - numpy.sqrt(-discr / 108))
-                ]
+                sqrt_discr = math.sqrt(-discr / 108)
+                t = [cbrt(-q / 2 + sqrt_discr) + cbrt(-q / 2 - sqrt_discr)]
             else:
+                # clipped as rounding errors can push it slightly out of [-1, 1]
+                cos_3theta = min(1.0, max(-1.0, 3 * q / 2 / p * math.sqrt(-3 / p)))
                 t = [
                     2
-                    * numpy.sqrt(-p / 3)
-                    * numpy.cos(
-                        1 / 3 * numpy.arccos(3 * q / 2 / p * numpy.sqrt(-3 / p))
-                        - 2 * numpy.pi * k / 3
-                    )
+                    * math.sqrt(-p / 3)
+                    * math.cos(1 / 3 * math.acos(cos_3theta) - 2 * math.pi * k / 3)
                     for k in range(3)
                 ]
-        return [x - b / 3 / a for x in t]
+        shift = b / 3
+        return [x - shift for x in t]
     else:
         return quadratic_roots(b, c, d)
 
 
+def cbrt(x: float) -> float:
+    """Real cube root, also defined for negative numbers"""
+    return math.copysign(abs(x) ** (1 / 3), x)
+
+
+def cubic_range(c0: float, c1: float, c2: float, c3: float) -> tuple[float, float]:
+    r"""
+    Returns the minimum and maximum of the polynomial
+
+    .. math::
+        c_0 + c_1 s + c_2 s^2 + c_3 s^3
+
+    for :math:`0 \le s \le 1`
+    """
+
+    # The extrema are at the bounds or where the derivative is zero
+    values = [c0, c0 + c1 + c2 + c3]
+    for s in quadratic_roots(3 * c3, 2 * c2, c1):
+        if 0 < s < 1:
+            values.append(c0 + s * (c1 + s * (c2 + s * c3)))
+    return min(values), max(values)
+
+
 def quadratic_roots(a: float, b: float, c: float) -> list[float]:
     if not is_almost_zero(a):
         discr = b ** 2 - 4 * a * c
         if discr > 0:
             return [
-                (-b + numpy.sqrt(discr)) / 2 / a,
-                (-b - numpy.sqrt(discr)) / 2 / a,
+                (-b + math.sqrt(discr)) / 2 / a,
+                (-b - math.sqrt(discr)) / 2 / a,
             ]
         elif is_almost_zero(discr):
             return [-b / 2 / a]
@@ -213,5 +500,70 @@ def linear_root(a: float, b: float) -> list[float]:
         return [-b / a]
 
 
+def cubic_real_roots_many(
+    d: numpy.ndarray, c: numpy.ndarray, b: numpy.ndarray, a: numpy.ndarray
+) -> numpy.ndarray:
+    """
+    Same as cubic_real_roots for n polynomials at once
+
+    The coefficients are arrays of length n. Returns an array of shape (n, 3)
+    with the real roots of each polynomial, padded with nan.
+    """
+
+    d, c, b, a = (numpy.asarray(coef, dtype=numpy.float64) for coef in (d, c, b, a))
+    roots = numpy.full((len(a), 3), numpy.nan)
+    # The branches of cubic_real_roots are followed with masks. Each
+    # polynomial takes a single branch, but all of them are computed, so the
+    # floating point warnings of the branches not taken are ignored.
+    with numpy.errstate(all="ignore"):
+        cubic = ~almost_zero(a)
+        # Depressed cubic computed from the monic polynomial
+        bm, cm, dm = b / a, c / a, d / a
+        p = cm - bm * bm / 3
+        q = (2 * bm * bm - 9 * cm) * bm / 27 + dm
+        discr = -(4 * p ** 3 + 27 * q * q)
+        shift = -bm / 3
+        p_zero = cubic & almost_zero(p)
+        roots[p_zero, 0] = (numpy.cbrt(-q) + shift)[p_zero]
+        cubic &= ~p_zero
+        double = cubic & almost_zero(discr)
+        triple = double & almost_zero(q)
+        roots[triple, 0] = shift[triple]
+        double &= ~triple
+        roots[double, 0] = (3 * q / p + shift)[double]
+        roots[double, 1] = (-3 * q / 2 / p + shift)[double]
+        cubic &= ~almost_zero(discr)
+        single = cubic & (discr < 0)
+        sqrt_discr = numpy.sqrt(-discr / 108)
+        roots[single, 0] = (
+            numpy.cbrt(-q / 2 + sqrt_discr) + numpy.cbrt(-q / 2 - sqrt_discr) + shift
+        )[single]
+        three = cubic & (discr > 0)
+        # clipped as rounding errors can push it slightly out of [-1, 1]
+        cos_3theta = numpy.clip(3 * q / 2 / p * numpy.sqrt(-3 / p), -1, 1)
+        angle = numpy.arccos(cos_3theta) / 3
+        for k in range(3):
+            roots[three, k] = (
+                2 * numpy.sqrt(-p / 3) * numpy.cos(angle - 2 * numpy.pi * k / 3) + shift
+            )[three]
+
+        quadratic = almost_zero(a) & ~almost_zero(b)
+        discr = c ** 2 - 4 * b * d
+        two = quadratic & (discr > 0)
+        roots[two, 0] = ((-c + numpy.sqrt(discr)) / 2 / b)[two]
+        roots[two, 1] = ((-c - numpy.sqrt(discr)) / 2 / b)[two]
+        one = quadratic & ~(discr > 0) & almost_zero(discr)
+        roots[one, 0] = (-c / 2 / b)[one]
+
+        linear = almost_zero(a) & almost_zero(b) & ~almost_zero(c)
+        roots[linear, 0] = (-d / c)[linear]
+    return roots
+
+
+def almost_zero(x: numpy.ndarray) -> numpy.ndarray:
+    """Same as is_almost_zero for all the elements of an array"""
+    return numpy.abs(x) <= 1e-8
+
+
 def is_almost_zero(x: float) -> bool:
     return math.isclose(x, 0, abs_tol=1e-8)
@@ -1,24 +1,28 @@
 from __future__ import annotations
 
 import functools
+import math
 from dataclasses import dataclass
-from typing import Protocol, Iterable, TypeVar, Generic
-
-import numpy
+from typing import Protocol, Iterable, TypeVar, Generic, TYPE_CHECKING
 
 from ..ray import Ray
-from ..shade import ShadeRec
+from ..shade import NO_HIT, ShadeRec
 from ..vector import Vector
 
+if TYPE_CHECKING:
+    from ..bvh import BVHNode
+
 
 class GeometricObject(Protocol):
     """Protocol for a geometric object (line, rectangle, circle, ...)"""
 
-    def hit(self, ray: Ray) -> ShadeRec:
+    def hit(self, ray: Ray, t_max: float = math.inf) -> ShadeRec:
         """Tests if a collision between a beam and the object occurred
 
         Returns a shade that contains the information about the collision in
-        case it happened.
+        case it happened. Collisions after a travel distance t_max are ignored,
+        which allows to skip the computations when they can't give a closer
+        collision than one already known.
         """
         raise NotImplementedError
 
@@ -26,6 +30,11 @@ class GeometricObject(Protocol):
         """Returns the number of times a beam intersect the object boundary"""
         raise NotImplementedError
 
+    def parity_hits(self, ray: Ray) -> int:
+        """Returns the parity (0 or 1) of the number of times a beam intersect
+        the object boundary"""
+        return self.num_hits(ray) & 1
+
     @property
     def aabbox(self) -> AABBox:
         """Computes an axis aligned bounding box for the object"""
@@ -62,40 +71,72 @@ class CompoundGeometricObject(GeometricObject, Generic[T]):
 
     @functools.cached_property
     def aabbox(self):
-        sub_boxes = (sub.aabbox for sub in self.sub_objects)
-        return AABBox.englobing(sub_boxes)
+        # Same as englobing the boxes of the sub objects, without computing
+        # the boxes of the nested compound objects
+        return AABBox.englobing(leaf.aabbox for leaf in self.leaves)
+
+    @functools.cached_property
+    def leaves(self) -> tuple[GeometricObject, ...]:
+        """Objects composing this object, with nested compound objects flattened"""
+        leaves = list()
+        for obj in self.sub_objects:
+            if isinstance(obj, CompoundGeometricObject):
+                leaves.extend(obj.leaves)
+            else:
+                leaves.append(obj)
+        return tuple(leaves)
+
+    @functools.cached_property
+    def bvh(self) -> BVHNode:
+        """
+        Bounding volume hierarchy over the leaves, built the first time the
+        object is tested for a collision
+        """
+
+        # Imported here as the hierarchy is built from geometric objects
+        from ..bvh import build_bvh
+
+        return build_bvh(self.leaves)
+
+    def leaves_hit(self, ray: Ray) -> Iterable[GeometricObject]:
+        """
+        Returns the leaves whose bounding box may be intersected by the beam
+
+        The leaves are found through the hierarchy built over them, so that
+        nested compound objects don't need to test their own bounding box,
+        and the branches not crossed by the beam are skipped.
+        """
+
+        return [self.leaves[index] for index in self.bvh.entered_leaves(ray)]
 
-    def hit(self, ray: Ray) -> ShadeRec:
+    def hit(self, ray: Ray, t_max: float = math.inf) -> ShadeRec:
         """
         Returns a shade with the information for the first intersection
         of a beam with one of the object composing the composite object
         """
 
-        result = ShadeRec()
-        if self.aabbox.hit(ray):
-            result = find_first_hit(ray, self.sub_objects)
+        # Only the leaves whose bounding box is entered before the closest
+        # collision found so far are tested
+        result, __ = self.bvh.first_hit(
+            ray, lambda index, t_max: self.leaves[index].hit(ray, t_max), t_max
+        )
+        if result is not NO_HIT:
             result.hit_geometry = self
         return result
 
     def is_inside(self, ray: Ray) -> bool:
         # A ray is inside an object if it intersect its boundary an odd
         # number of times
-        return (self.num_hits(ray) % 2) == 1
+        return bool(self.parity_hits(ray))
 
     def num_hits(self, ray: Ray) -> int:
-        if self.aabbox.hit(ray):
-            return sum([obj.num_hits(ray) for obj in self.sub_objects])
-        else:
-            return 0
+        return sum([obj.num_hits(ray) for obj in self.leaves_hit(ray)])
 
-
-def find_first_hit(ray: Ray, objects: Iterable[GeometricObject]) -> ShadeRec:
-    result = ShadeRec()
-    for obj in objects:
-        shade = obj.hit(ray)
-        if Ray.min_travel < shade.travel_dist < result.travel_dist:
-            result = shade
-    return result
+    def parity_hits(self, ray: Ray) -> int:
+        parity = 0
+        for obj in self.leaves_hit(ray):
+            parity ^= obj.parity_hits(ray)
+        return parity
 
 
 @dataclass(frozen=True)
@@ -113,40 +154,60 @@ class AABBox:
 
     @classmethod
     def englobing(cls, aabboxes: Iterable[AABBox]) -> AABBox:
-        return functools.reduce(cls.englobing_two, aabboxes)
-
-    @classmethod
-    def englobing_two(cls, b1: AABBox, b2: AABBox) -> AABBox:
-        union_lower_left = Vector(
-            min(b1.lower_left.x, b2.lower_left.x),
-            min(b1.lower_left.y, b2.lower_left.y),
-        )
-        union_upper_right = Vector(
-            max(b1.upper_right.x, b2.upper_right.x),
-            max(b1.upper_right.y, b2.upper_right.y),
+        # Smallest box containing all the boxes, from the extreme corners
+        # found in a single pass
+        boxes = tuple(aabboxes)
+        return cls(
+            Vector(
+                min(box.lower_left.x for box in boxes),
+                min(box.lower_left.y for box in boxes),
+            ),
+            Vector(
+                max(box.upper_right.x for box in boxes),
+                max(box.upper_right.y for box in boxes),
+            ),
         )
-        return AABBox(union_lower_left, union_upper_right)
 
     def hit(self, ray: Ray) -> bool:
         """Tests if a beam intersects the bounding box"""
 
-        # This algorithm uses the properties of IEEE floating-point
-        # arithmetic to correctly handle cases where the ray travels
-        # parallel to a coordinate axis.
-        # See Williams et al. "An efficient and robust ray-box intersection
-        # algorithm" for more details.
-
-        p0 = numpy.array([self.lower_left.x, self.lower_left.y])
-        p1 = numpy.array([self.upper_right.x, self.upper_right.y])
-        direction = numpy.array([ray.direction.x, ray.direction.y])
-        origin = numpy.array([ray.origin.x, ray.origin.y])
-        # The implementation safely handles the case where an element
-        # of ray.direction is zero. Warning for floating point error
-        # can be ignored for this step.
-        with numpy.errstate(invalid="ignore", divide="ignore"):
-            a = 1 / direction
-            t_min = (numpy.where(a >= 0, p0, p1) - origin) * a
-            t_max = (numpy.where(a >= 0, p1, p0) - origin) * a
-        t0 = numpy.max(t_min)
-        t1 = numpy.min(t_max)
-        return (t0 < t1) and (t1 > Ray.min_travel)
+        # The slab test is done on plain floats: for two dimensions, building
+        # numpy arrays costs much more than the arithmetic itself.
+        return self.entry_distance(ray) < math.inf
+
+    def entry_distance(self, ray: Ray) -> float:
+        """
+        Returns the distance traveled by a beam before entering the bounding
+        box, or infinity if the beam misses it.
+
+        The distance is negative if the origin of the beam is inside the box.
+        """
+
+        # Unrolled over the two slabs x and y, on plain floats
+        ox, oy = ray.origin.x, ray.origin.y
+        ax, ay = ray.inv_direction.x, ray.inv_direction.y
+        lx, ly = self.lower_left.x, self.lower_left.y
+        ux, uy = self.upper_right.x, self.upper_right.y
+
+        if math.isinf(ax):
+            # Beam parallel to the slab: either always or never inside it
+            if not lx <= ox <= ux:
+                return math.inf
+            t0, t1 = -math.inf, math.inf
+        elif ax >= 0:
+            t0, t1 = (lx - ox) * ax, (ux - ox) * ax
+        else:
+            t0, t1 = (ux - ox) * ax, (lx - ox) * ax
+
+        if math.isinf(ay):
+            if not ly <= oy <= uy:
+                return math.inf
+        elif ay >= 0:
+            t0, t1 = max(t0, (ly - oy) * ay), min(t1, (uy - oy) * ay)
+        else:
+            t0, t1 = max(t0, (uy - oy) * ay), min(t1, (ly - oy) * ay)
+
+        if t0 <= t1 and t1 > Ray.min_travel:
+            return t0
+        else:
+            return math.inf
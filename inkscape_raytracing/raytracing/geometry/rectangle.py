@@ -0,0 +1,100 @@
+"""
+Module for handling rectangles aligned with the axes
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import cached_property
+
+from .geometric_object import AABBox, GeometricObject
+from ..ray import Ray
+from ..shade import NO_HIT, ShadeRec
+from ..vector import Vector, UnitVector
+
+
+@dataclass(frozen=True)
+class AxisAlignedRectangle(GeometricObject):
+    """
+    Contour of a rectangle whose sides are aligned with the axes
+
+    The intersections with a beam are found with a few float comparisons,
+    which is much cheaper than representing the sides as bezier segments.
+    """
+
+    lower_left: Vector
+    upper_right: Vector
+
+    def __init__(self, lower_left, upper_right):
+        # Need to overwrite protocol parent __init__ for some python versions.
+        # Any two opposite corners are accepted, they are reordered so that
+        # lower_left has the smallest coordinates.
+        (x0, y0), (x1, y1) = lower_left, upper_right
+        object.__setattr__(self, "lower_left", Vector(min(x0, x1), min(y0, y1)))
+        object.__setattr__(self, "upper_right", Vector(max(x0, x1), max(y0, y1)))
+
+    @cached_property
+    def aabbox(self) -> AABBox:
+        # The box is slightly larger than the rectangle so that beams
+        # travelling along a side still hit the box.
+        return AABBox(
+            Vector(self.lower_left.x - 1e-6, self.lower_left.y - 1e-6),
+            Vector(self.upper_right.x + 1e-6, self.upper_right.y + 1e-6),
+        )
+
+    def intersection_beam(self, ray: Ray) -> list[tuple[float, UnitVector]]:
+        """
+        Returns all couples (t, normal) such that the beam crosses a side of
+        the rectangle after traveling a distance t, and normal is the normal
+        to this side
+        """
+
+        intersections = list()
+        ox, oy = ray.origin
+        dx, dy = ray.direction
+        x0, y0 = self.lower_left
+        x1, y1 = self.upper_right
+        if dx != 0:
+            for x in (x0, x1):
+                t = (x - ox) / dx
+                if t > Ray.min_travel and y0 <= oy + t * dy <= y1:
+                    intersections.append((t, UnitVector(1, 0)))
+        if dy != 0:
+            for y in (y0, y1):
+                t = (y - oy) / dy
+                if t > Ray.min_travel and x0 <= ox + t * dx <= x1:
+                    intersections.append((t, UnitVector(0, 1)))
+        return intersections
+
+    def num_hits(self, ray: Ray) -> int:
+        return len(self.intersection_beam(ray))
+
+    def hit(self, ray: Ray, t_max: float = math.inf) -> ShadeRec:
+        """
+        Returns a shade with the information for the first intersection
+        of a beam with the contour of the rectangle
+        """
+
+        shade = NO_HIT
+        intersections = [
+            (t, normal) for (t, normal) in self.intersection_beam(ray) if t < t_max
+        ]
+        if len(intersections) > 0:
+            travel_dist, normal = min(intersections, key=lambda item: item[0])
+            shade = ShadeRec()
+            shade.travel_dist = travel_dist
+            shade.local_hit_point = ray.point_at(travel_dist)
+            shade.normal = normal
+            shade.set_normal_same_side(ray.origin)
+            shade.hit_geometry = self
+        return shade
+
+    def is_inside(self, ray: Ray) -> bool:
+        # Same as crossing the contour an odd number of times, which for a
+        # rectangle is to start inside it
+        x, y = ray.origin
+        return (
+            self.lower_left.x <= x <= self.upper_right.x
+            and self.lower_left.y <= y <= self.upper_right.y
+        )
@@ -8,6 +8,8 @@ from ..shade import ShadeRec
 class BeamDump(OpticMaterial):
     """Material absorbing all beams that hit it"""
 
+    absorbing = True
+
     def __repr__(self):
         return "BeamDump()"
 
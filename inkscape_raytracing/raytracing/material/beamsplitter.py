@@ -1,10 +1,8 @@
 from typing import List
 
-import numpy as np
-
 from ..ray import Ray
 from ..shade import ShadeRec
-from .optic_material import OpticMaterial
+from .optic_material import OpticMaterial, reflect
 
 
 class BeamSplitter(OpticMaterial):
@@ -18,7 +16,6 @@ class BeamSplitter(OpticMaterial):
 
     def generated_beams(self, ray: Ray, shade: ShadeRec) -> List[Ray]:
         o, d = shade.local_hit_point, ray.direction
-        n = shade.normal
-        reflected_ray = Ray(o, d - 2 * np.dot(d, n) * n)
+        reflected_ray = Ray(o, reflect(d, shade.normal))
         transmitted_ray = Ray(o, d)
         return [reflected_ray, transmitted_ray]
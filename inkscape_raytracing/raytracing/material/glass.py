@@ -1,9 +1,9 @@
+import math
 from typing import List
 
-import numpy as np
-
 from ..ray import Ray
 from ..shade import ShadeRec
+from ..vector import Vector
 from .optic_material import OpticMaterial
 
 
@@ -12,6 +12,10 @@ class Glass(OpticMaterial):
 
     def __init__(self, optical_index):
         self._optical_index = optical_index
+        # Ratio n_1 / n_2 of the indices of refraction on each side of the
+        # surface, for beams coming from inside and from outside of the glass
+        self._ratio_from_inside = optical_index
+        self._ratio_from_outside = 1 / optical_index
 
     @property
     def optical_index(self):
@@ -21,19 +25,20 @@ class Glass(OpticMaterial):
         return f"Glass({self._optical_index})"
 
     def generated_beams(self, ray: Ray, shade: ShadeRec) -> List[Ray]:
-        o, d = shade.local_hit_point, ray.direction
-        n = shade.normal
+        o, d, n = shade.local_hit_point, ray.direction, shade.normal
+        # The directions are computed on floats
+        (dx, dy), (nx, ny) = d, n
         if shade.hit_geometry.is_inside(ray):
-            n_1, n_2 = self.optical_index, 1
+            r = self._ratio_from_inside
         else:
-            n_1, n_2 = 1, self.optical_index
-        r = n_1 / n_2
-        c1 = -np.dot(d, n)
+            r = self._ratio_from_outside
+        # cosine of the incidence angle, shared by reflection and refraction
+        c1 = -(dx * nx + dy * ny)
         u = 1 - r ** 2 * (1 - c1 ** 2)
-        if u < 0:  # total internal reflection
-            reflected_ray = Ray(o, d - 2 * np.dot(d, n) * n)
+        if u < 0:  # total internal reflection, d + 2 c1 n
+            reflected_ray = Ray(o, Vector(dx + 2 * c1 * nx, dy + 2 * c1 * ny))
             return [reflected_ray]
-        else:  # refraction
-            c2 = np.sqrt(u)
-            transmitted_ray = Ray(o, r * d + (r * c1 - c2) * n)
+        else:  # refraction, r d + (r c1 - sqrt(u)) n
+            k = r * c1 - math.sqrt(u)
+            transmitted_ray = Ray(o, Vector(r * dx + k * nx, r * dy + k * ny))
             return [transmitted_ray]
@@ -1,10 +1,8 @@
 from typing import List
 
-import numpy
-
 from ..ray import Ray
 from ..shade import ShadeRec
-from .optic_material import OpticMaterial
+from .optic_material import OpticMaterial, reflect
 
 
 class Mirror(OpticMaterial):
@@ -14,7 +12,5 @@ class Mirror(OpticMaterial):
         return "Mirror()"
 
     def generated_beams(self, ray: Ray, shade: ShadeRec) -> List[Ray]:
-        o, d = shade.local_hit_point, ray.direction
-        n = shade.normal
-        reflected_ray = Ray(o, d - 2 * numpy.dot(d, n) * n)
+        reflected_ray = Ray(shade.local_hit_point, reflect(ray.direction, shade.normal))
         return [reflected_ray]
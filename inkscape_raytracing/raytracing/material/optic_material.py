@@ -1,13 +1,18 @@
 from abc import abstractmethod
-from typing import Protocol, List
+from typing import ClassVar, Protocol, List
 
 from ..ray import Ray
 from ..shade import ShadeRec
+from ..vector import Vector
 
 
 class OpticMaterial(Protocol):
     """Protocol for an optical material"""
 
+    # Materials that absorb every beam hitting them never generate new beams
+    # and the tracer doesn't need to call generated_beams for them.
+    absorbing: ClassVar[bool] = False
+
     @abstractmethod
     def generated_beams(self, ray: Ray, shade: ShadeRec) -> List[Ray]:
         """Compute the beams generated after intersection of a beam with this
@@ -17,3 +22,15 @@ class OpticMaterial(Protocol):
         of a beam and an object.
         """
         raise NotImplementedError
+
+
+def reflect(direction: Vector, normal: Vector) -> Vector:
+    """
+    Returns the direction of a beam after reflection on a surface of given
+    unit normal, d - 2 (d.n) n
+    """
+
+    # Computed on floats, as this is done for every reflection
+    (dx, dy), (nx, ny) = direction, normal
+    k = 2 * (dx * nx + dy * ny)
+    return Vector(dx - k * nx, dy - k * ny)
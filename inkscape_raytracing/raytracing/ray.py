@@ -1,4 +1,6 @@
+import math
 from dataclasses import dataclass
+from functools import cached_property
 from typing import ClassVar
 
 from .vector import UnitVector, Vector
@@ -16,3 +18,24 @@ class Ray:
     # from its origin, the collision is ignored. This prevents infinite
     # collision in case the origin of a beam is on the surface of an object
     min_travel: ClassVar[float] = 1e-7
+
+    @cached_property
+    def inv_direction(self) -> Vector:
+        """
+        Component-wise inverse of the direction, used by the ray-box tests
+
+        A zero component gives an infinite inverse with the sign of the zero,
+        as with IEEE floating-point division.
+        """
+
+        return Vector(
+            *(1 / d if d else math.copysign(math.inf, d) for d in self.direction)
+        )
+
+    def point_at(self, t: float) -> Vector:
+        """Position of the beam after traveling a distance t"""
+
+        # Same as origin + t * direction, on floats
+        return Vector(
+            self.origin.x + t * self.direction.x, self.origin.y + t * self.direction.y
+        )
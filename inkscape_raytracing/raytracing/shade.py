@@ -1,5 +1,11 @@
-import numpy as np
-from typing import Optional
+from __future__ import annotations
+
+import math
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .geometry import GeometricObject
+    from .vector import Vector
 
 
 class ShadeRec(object):
@@ -8,14 +14,20 @@ class ShadeRec(object):
     between a ray and an object.
     """
 
+    # Many shades are created while searching for a collision
+    __slots__ = (
+        "hit_an_object",
+        "local_hit_point",
+        "normal",
+        "travel_dist",
+        "hit_geometry",
+    )
+
     def __init__(self):
         self.hit_an_object: bool = False
-        self.local_hit_point: Optional[np.ndarray] = None
-        self.normal: Optional[np.ndarray] = None
-        self.travel_dist: float = np.inf
-
-        from .geometry import GeometricObject
-
+        self.local_hit_point: Optional[Vector] = None
+        self.normal: Optional[Vector] = None
+        self.travel_dist: float = math.inf
         self.hit_geometry: Optional[GeometricObject] = None
 
     def __repr__(self):
@@ -24,12 +36,20 @@ class ShadeRec(object):
             f"{self.normal}, {self.travel_dist})"
         )
 
-    def set_normal_same_side(self, point: np.ndarray):
+    def set_normal_same_side(self, point: Vector):
         if self.normal is None:
             raise RuntimeError("Can't find normal orientation if not already defined.")
         elif self.local_hit_point is None:
             raise RuntimeError(
                 "Can't find normal orientation if hit point not defined."
             )
-        elif np.dot(self.normal, self.local_hit_point - point) > 0:
-            self.normal = -self.normal
+        else:
+            # Same as testing the sign of normal . (local_hit_point - point)
+            (nx, ny), (x, y) = self.normal, self.local_hit_point
+            if nx * (x - point.x) + ny * (y - point.y) > 0:
+                self.normal = -self.normal
+
+
+# Shade shared by all the searches that don't find any collision, so that
+# they don't need to create a new one. It must not be modified.
+NO_HIT = ShadeRec()
@@ -1,15 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from functools import singledispatchmethod
+from itertools import chain
 from math import sqrt
 from numbers import Real
+from typing import Iterable, Iterator
+
+import numpy
 
 
 @dataclass(frozen=True)
 class Vector:
-    x: float = field()
-    y: float = field()
+    # Vectors are created for every point and direction of every ray, the
+    # slots make them lighter and faster to create than with a __dict__
+    __slots__ = ("x", "y")
+
+    x: float
+    y: float
+
+    # Frozen instances can't be restored by the default pickling of slots
+    def __getstate__(self):
+        return self.x, self.y
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "x", state[0])
+        object.__setattr__(self, "y", state[1])
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.x
+        yield self.y
 
     def orthogonal(self) -> Vector:
         """Return a vector obtained by a pi/2 rotation"""
@@ -51,11 +71,22 @@ class Vector:
 
 @dataclass(frozen=True)
 class UnitVector(Vector):
+    __slots__ = ()
+
     def __init__(self, x, y):
         norm = sqrt(x ** 2 + y ** 2)
         super().__init__(x / norm, y / norm)
 
 
+def vectors_to_array(vectors: Iterable[Vector]) -> numpy.ndarray:
+    """
+    Packs the coordinates of several vectors in a contiguous array of shape
+    (n, 2), suitable for vectorized computations over all of them.
+    """
+    coordinates = numpy.fromiter(chain.from_iterable(vectors), dtype=numpy.float64)
+    return coordinates.reshape(-1, 2)
+
+
 @Vector.__add__.register
 def _(self, other: Vector):
     return Vector(self.x + other.x, self.y + other.y)
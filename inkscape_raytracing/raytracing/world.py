@@ -6,12 +6,13 @@ from __future__ import annotations
 
 import warnings
 from dataclasses import dataclass, field
-from typing import Optional, List, NamedTuple, Iterable, Tuple
+from typing import Optional, List, NamedTuple, Iterable, Iterator, Tuple
 
+from .bvh import BVHNode, build_bvh
 from .geometry import GeometricObject
 from .material import OpticMaterial, BeamDump
 from .ray import Ray
-from .shade import ShadeRec
+from .shade import NO_HIT, ShadeRec
 
 
 class OpticalObject(NamedTuple):
@@ -24,12 +25,25 @@ class World:
     """Stores a scene and computes the interaction with a ray"""
 
     objects: Optional[list[OpticalObject]] = field(default_factory=list)
-    # default recursion depth can be changed, but should not exceed
-    # system recursion limit.
+    # Maximal number of successive collisions computed for a beam
     max_recursion_depth: Optional[int] = 500
+    # Acceleration structure for the search of collisions, see build_bvh.
+    bvh: Optional[BVHNode] = None
 
     def add(self, obj: OpticalObject):
         self.objects.append(obj)
+        # The hierarchy doesn't know about the new object
+        self.bvh = None
+
+    def build_bvh(self):
+        """
+        Builds a bounding volume hierarchy over the objects of the scene
+
+        It is built by the first call to first_hit after objects are added,
+        if it wasn't built before.
+        """
+
+        self.bvh = build_bvh([obj.geometry for obj in self.objects])
 
     def __iter__(self) -> Iterable[OpticalObject]:
         return iter(self.objects)
@@ -46,22 +60,22 @@ class World:
         :return: A shade for the collision geometric information and the
         material of the object hit.
         """
-        result = ShadeRec()
+        result = NO_HIT
         material = BeamDump()
-        for obj in self:
-            shade = obj.geometry.hit(ray)
-            if Ray.min_travel < shade.travel_dist < result.travel_dist:
-                result = shade
-                material = obj.material
+        if self.bvh is None:
+            self.build_bvh()
+        if self.bvh is not None:  # the world is not empty
+            result, index = self.bvh.first_hit(
+                ray, lambda index, t_max: self.objects[index].geometry.hit(ray, t_max)
+            )
+            if index is not None:
+                material = self.objects[index].material
         return result, material
 
-    def propagate_beams(self, seed):
-        return self._propagate_beams([[seed]], 0)
-
-    def _propagate_beams(self, beams: List[List[Ray]], depth) -> List[List[Ray]]:
+    def propagate_beams(self, seed: Ray) -> List[List[Ray]]:
         """Computes the propagation of beams in the system
 
-        :return: List of all the beam paths generated by these seeds.
+        :return: List of all the beam paths generated by this seed.
             It is stored as
             [path0[Ray0, Ray1, ...], path1[...], ...].
             Each path is a list of successive rays having each traveled a
@@ -69,25 +83,52 @@ class World:
         :raise: warning if recursion depth hits a limit.
         """
 
-        if depth >= self.max_recursion_depth:
-            err_msg = (
-                f"Maximal recursion depth exceeded ({self.max_recursion_depth})."
-                "It is  likely that not all beams have been rendered."
-            )
-            warnings.warn(err_msg)
-            return beams
-        else:
-            new_beams = list()
-            for index, beam in enumerate(beams):
-                ray = beam[-1]
-                if ray.travel <= 0:
-                    shade, material = self.first_hit(ray)
-                    new_seeds = material.generated_beams(ray, shade)
-                    beams[index][-1] = Ray(ray.origin, ray.direction, shade.travel_dist)
-                    if len(new_seeds) == 0:
-                        new_beams.append(beams[index])
-                    for seed in new_seeds:
-                        generated_beams = self._propagate_beams([[seed]], depth + 1)
-                        for new_beam in generated_beams:
-                            new_beams.append(beams[index] + new_beam)
-            return new_beams
+        return list(self.iter_beams(seed))
+
+    def iter_beams(self, seed: Ray) -> Iterator[List[Ray]]:
+        """Same as propagate_beams, but yields each beam path as soon as the
+        propagation of its last ray is computed"""
+
+        # Rays still to propagate, with the path that led to them and the
+        # number of collisions along this path. The rays generated by a
+        # collision share the same path, which is only copied into a list
+        # once a beam is terminated.
+        stack: List[Tuple[Ray, Optional[_RayNode], int]] = [(seed, None, 0)]
+        while stack:
+            ray, path, depth = stack.pop()
+            if depth >= self.max_recursion_depth:
+                err_msg = (
+                    f"Maximal recursion depth exceeded ({self.max_recursion_depth})."
+                    "It is  likely that not all beams have been rendered."
+                )
+                warnings.warn(err_msg)
+                yield _RayNode(ray, path).to_list()
+                continue
+
+            shade, material = self.first_hit(ray)
+            if material.absorbing:
+                new_seeds = ()
+            else:
+                new_seeds = material.generated_beams(ray, shade)
+            path = _RayNode(Ray(ray.origin, ray.direction, shade.travel_dist), path)
+            if len(new_seeds) == 0:
+                yield path.to_list()
+            # Reversed to process the generated beams in order
+            for new_seed in reversed(new_seeds):
+                stack.append((new_seed, path, depth + 1))
+
+
+class _RayNode(NamedTuple):
+    """Ray in a path stored as a linked list going back to the seed"""
+
+    ray: Ray
+    parent: Optional[_RayNode]
+
+    def to_list(self) -> List[Ray]:
+        rays = list()
+        node = self
+        while node is not None:
+            rays.append(node.ray)
+            node = node.parent
+        rays.reverse()
+        return rays
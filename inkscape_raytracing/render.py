@@ -3,20 +3,24 @@ Extension for rendering beams in 2D optics with Inkscape
 """
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from functools import singledispatchmethod
 from typing import Iterable, Optional, Final
 
 import inkex
-from inkex.paths import Line, Move
+import numpy
 
 import raytracing.material
-from desc_parser import get_optics_fields
-from raytracing import Vector
+from desc_parser import get_description, get_optics_fields
+from raytracing import Vector, vectors_to_array
 from raytracing import World, OpticalObject, Ray
-from raytracing.geometry import CubicBezier, CompoundGeometricObject
-from raytracing.geometry import GeometricObject
-from utils import pairwise
+from raytracing.geometry import (
+    AxisAlignedRectangle,
+    CubicBezierPath,
+    CompositeCubicBezier,
+)
 
 
 @dataclass
@@ -44,16 +48,33 @@ def get_or_create_beam_layer(parent_layer: inkex.Layer) -> inkex.Layer:
     return new_layer
 
 
-def plot_beam(beam: list[Ray], node: inkex.ShapeElement, layer: inkex.Layer):
-    path = inkex.Path()
+def plot_beam(beam: list[Ray], group: inkex.Group):
+    path_data = ""
     if beam:
-        path += [Move(beam[0].origin.x, beam[0].origin.y)]
-        for ray in beam:
-            p1 = ray.origin + ray.travel * ray.direction
-            path += [Line(p1.x, p1.y)]
-    element = layer.add(inkex.PathElement())
-    element.style = node.specified_style()
-    element.path = path
+        # Start and end points of all the rays of the beam, computed at once
+        origins = vectors_to_array(ray.origin for ray in beam)
+        directions = vectors_to_array(ray.direction for ray in beam)
+        travels = numpy.array([ray.travel for ray in beam])
+        end_points = origins + travels[:, numpy.newaxis] * directions
+        points = numpy.concatenate((origins[:1], end_points))
+        # The path data is formatted directly, as inkex.Path would do, rather
+        # than through a Move and Line object for each point
+        path_data = "M " + " L ".join(f"{x:g} {y:g}" for x, y in points.tolist())
+    element = group.add(inkex.PathElement())
+    element.set("d", path_data)
+
+
+# World used by the worker processes to propagate beam seeds in parallel
+_worker_world: Optional[World] = None
+
+
+def _set_worker_world(world: World) -> None:
+    global _worker_world
+    _worker_world = world
+
+
+def _propagate_in_worker(ray: Ray) -> list[list[Ray]]:
+    return _worker_world.propagate_beams(ray)
 
 
 class Raytracing(inkex.EffectExtension):
@@ -70,10 +91,24 @@ class Raytracing(inkex.EffectExtension):
         inkex.Circle,
     )
 
+    # Elements of the selection that are processed
+    selection_filter: Final = filter_primitives + (inkex.Group, inkex.Use)
+
+    # Beam seeds are only propagated in parallel processes if there are at
+    # least this many of them. Below, starting the processes takes longer
+    # than the propagation itself.
+    min_parallel_seeds: Final = 16
+
     def __init__(self):
         super().__init__()
         self.world = World()
         self.beam_seeds: list[BeamSeed] = list()
+        # Geometries already computed, indexed by the id of their element.
+        # The element is stored with its geometry so that its id can't be
+        # reused by another element.
+        self._geometries: dict[
+            int, tuple[inkex.ShapeElement, CompositeCubicBezier]
+        ] = dict()
 
     def effect(self) -> None:
         """
@@ -84,54 +119,94 @@ class Raytracing(inkex.EffectExtension):
         self.document_border = self.get_document_borders_as_beamdump()
         self.world.add(self.document_border)
 
-        filter_ = self.filter_primitives + (inkex.Group, inkex.Use)
-        for obj in self.svg.selection.filter(filter_):
+        for obj in self.svg.selection.filter(self.selection_filter):
             self.add(obj)
+        self.world.build_bvh()
+
+        seeds = [seed for seed in self.beam_seeds if self.is_inside_document(seed.ray)]
+        # The beams coming from the same element are drawn in a group that
+        # holds the style of the element, so that it is only written once.
+        # Several seeds can come from the same element.
+        beam_groups: dict[int, inkex.Group] = dict()
+        for seed, generated in zip(seeds, self.propagate_seeds(seeds)):
+            group = beam_groups.get(id(seed.parent))
+            if group is None:
+                try:
+                    new_layer = get_or_create_beam_layer(
+                        get_containing_layer(seed.parent)
+                    )
+                except LayerError as e:
+                    inkex.utils.errormsg(f"{e} It will be ignored.")
+                    continue
+                group = new_layer.add(inkex.Group())
+                group.style = seed.parent.specified_style()
+                beam_groups[id(seed.parent)] = group
+            for beam in generated:
+                plot_beam(beam, group)
+
+    def propagate_seeds(self, seeds: list[BeamSeed]) -> Iterable[Iterable[list[Ray]]]:
+        """
+        Computes the beam paths generated by each seed
+
+        The seeds are independent from each other. If there are enough of
+        them, they are propagated in parallel in several processes, each
+        having its own copy of the world.
+        """
+
+        rays = [seed.ray for seed in seeds]
+        if len(rays) >= self.min_parallel_seeds and (os.cpu_count() or 1) > 1:
+            try:
+                with ProcessPoolExecutor(
+                    initializer=_set_worker_world, initargs=(self.world,)
+                ) as executor:
+                    return list(executor.map(_propagate_in_worker, rays))
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # processes not available or terminated abruptly, propagate
+                # sequentially
+                pass
+        return [self.world.iter_beams(ray) for ray in rays]
+
+    def add(self, obj: inkex.BaseElement) -> None:
+        """
+        Adds an element to the ray tracing data structure, recursing into
+        groups and clones. Other elements are ignored.
+        """
 
-        if self.beam_seeds:
-            for seed in self.beam_seeds:
-                if self.is_inside_document(seed.ray):
-                    generated = self.world.propagate_beams(seed.ray)
-                    for beam in generated:
-                        try:
-                            new_layer = get_or_create_beam_layer(
-                                get_containing_layer(seed.parent)
-                            )
-                            plot_beam(beam, seed.parent, new_layer)
-                        except LayerError as e:
-                            inkex.utils.errormsg(f"{e} It will be ignored.")
-
-    @singledispatchmethod
-    def add(self, obj):
-        pass
-
-    @add.register
-    def _(self, group: inkex.Group):
-        for child in group:
-            self.add(child)
-
-    @add.register
-    def _(self, clone: inkex.Use):
-        copy = get_unlinked_copy(clone)
-        self.add(copy)
-
-    for type in filter_primitives:
-
-        @add.register(type)
-        def _(self, obj):
-            """
-            Extracts properties and adds the object to the ray tracing data
-            structure
-            """
-            material = get_material(obj)
-            if material:
-                if isinstance(material, BeamSeed):
-                    for ray in get_beams(obj):
-                        self.beam_seeds.append(BeamSeed(ray, parent=obj))
-                else:
-                    geometry = get_geometry(obj)
-                    opt_obj = OpticalObject(geometry, material)
-                    self.world.add(opt_obj)
+        # Plain isinstance checks: a singledispatchmethod builds a new bound
+        # dispatcher on every call, which adds up over large groups.
+        if isinstance(obj, self.filter_primitives):
+            self.add_primitive(obj)
+        elif isinstance(obj, inkex.Group):
+            for child in obj:
+                self.add(child)
+        elif isinstance(obj, inkex.Use):
+            self.add(get_unlinked_copy(obj))
+
+    def add_primitive(self, obj: inkex.ShapeElement) -> None:
+        """
+        Extracts properties and adds the object to the ray tracing data
+        structure
+        """
+        material = get_material(obj)
+        if material:
+            if isinstance(material, BeamSeed):
+                for ray in get_beams(self.get_geometry(obj)):
+                    self.beam_seeds.append(BeamSeed(ray, parent=obj))
+            else:
+                geometry = self.get_geometry(obj)
+                opt_obj = OpticalObject(geometry, material)
+                self.world.add(opt_obj)
+
+    def get_geometry(self, obj: inkex.ShapeElement) -> CompositeCubicBezier:
+        """
+        Returns the geometry of an element, only converting it the first time
+        the element is met (it can be both selected and inside a selected group)
+        """
+
+        key = id(obj)
+        if key not in self._geometries:
+            self._geometries[key] = (obj, get_geometry(obj))
+        return self._geometries[key][1]
 
     def get_document_borders_as_beamdump(self) -> OpticalObject:
         """
@@ -140,34 +215,7 @@ class Raytracing(inkex.EffectExtension):
         """
 
         c1x, c1y, c2x, c2y = self.svg.get_viewbox()
-        contour_geometry = CompoundGeometricObject(
-            (
-                CubicBezier(
-                    Vector(c1x, c1y),
-                    Vector(c1x, c1y),
-                    Vector(c2x, c1y),
-                    Vector(c2x, c1y),
-                ),
-                CubicBezier(
-                    Vector(c2x, c1y),
-                    Vector(c2x, c1y),
-                    Vector(c2x, c2y),
-                    Vector(c2x, c2y),
-                ),
-                CubicBezier(
-                    Vector(c2x, c2y),
-                    Vector(c2x, c2y),
-                    Vector(c1x, c2y),
-                    Vector(c1x, c2y),
-                ),
-                CubicBezier(
-                    Vector(c1x, c2y),
-                    Vector(c1x, c2y),
-                    Vector(c1x, c1y),
-                    Vector(c1x, c1y),
-                ),
-            )
-        )
+        contour_geometry = AxisAlignedRectangle(Vector(c1x, c1y), Vector(c2x, c2y))
         return OpticalObject(contour_geometry, raytracing.material.BeamDump())
 
     def is_inside_document(self, ray: Ray) -> bool:
@@ -179,7 +227,7 @@ def get_material(
 ) -> Optional[raytracing.material.OpticMaterial | BeamSeed]:
     """Extracts the optical material of an object from its description"""
 
-    desc = obj.desc
+    desc = get_description(obj)
     if desc is None:
         desc = ""
     materials = get_materials_from_description(desc)
@@ -191,28 +239,32 @@ def get_material(
         return materials[0]
 
 
+# Class of the material associated to each name in the descriptions
+material_aliases: Final = dict(
+    beam_dump=raytracing.material.BeamDump,
+    mirror=raytracing.material.Mirror,
+    beam_splitter=raytracing.material.BeamSplitter,
+    glass=raytracing.material.Glass,
+    beam=BeamSeed,
+)
+
+
 def get_materials_from_description(
     desc: str,
 ) -> list[raytracing.material.OpticMaterial | BeamSeed]:
     """Run through the description to extract the material properties"""
 
     materials = list()
-    class_alias = dict(
-        beam_dump=raytracing.material.BeamDump,
-        mirror=raytracing.material.Mirror,
-        beam_splitter=raytracing.material.BeamSplitter,
-        glass=raytracing.material.Glass,
-        beam=BeamSeed,
-    )
     for match in get_optics_fields(desc):
         material_type = match.group("material")
-        prop_str = match.group("num")
-        if material_type in class_alias:
-            if material_type == "glass" and prop_str is not None:
+        material_class = material_aliases.get(material_type)
+        if material_class is not None:
+            prop_str = match.group("num")
+            if material_class is raytracing.material.Glass and prop_str is not None:
                 optical_index = float(prop_str)
-                materials.append(class_alias[material_type](optical_index))
+                materials.append(material_class(optical_index))
             else:
-                materials.append(class_alias[material_type]())
+                materials.append(material_class())
     return materials
 
 
@@ -223,7 +275,7 @@ def raise_err_num_materials(obj):
     )
 
 
-def get_geometry(obj: inkex.ShapeElement) -> GeometricObject:
+def get_geometry(obj: inkex.ShapeElement) -> CompositeCubicBezier:
     """
     Converts the geometry of inkscape elements to a form suitable for the
     ray tracing module
@@ -239,27 +291,36 @@ def get_geometry(obj: inkex.ShapeElement) -> GeometricObject:
 
 
 def get_absolute_path(obj: inkex.ShapeElement) -> inkex.CubicSuperPath:
-    path = obj.to_path_element().path.to_absolute()
-    transformed_path = path.transform(obj.composed_transform())
-    return transformed_path.to_superpath()
-
-
-def get_beams(element: inkex.ShapeElement) -> Iterable[Ray]:
+    # The outline of the element, as to_path_element().path would give
+    # without also computing its style and serializing the path for a new
+    # element
+    path = obj.path
+    # Both conversions copy the whole path, they are skipped when they
+    # wouldn't change it.
+    if not all(command.letter.isupper() for command in path):
+        path = path.to_absolute()
+    transform = obj.composed_transform()
+    if transform:  # not the identity
+        path = path.transform(transform)
+    return path.to_superpath()
+
+
+def get_beams(bezier_path: CompositeCubicBezier) -> Iterable[Ray]:
     """
     Returns a beam with origin at the endpoint of the path and tangent to
     the path
     """
-    bezier_path = convert_to_composite_bezier(get_absolute_path(element))
     for sub_path in bezier_path:
         last_segment = sub_path[-1]
-        endpoint = last_segment.eval(1)
+        # The curve ends on its last control point, no need to evaluate it
+        endpoint = last_segment.p3
         tangent = -last_segment.tangent(1)
         yield Ray(endpoint, tangent)
 
 
 def convert_to_composite_bezier(
     superpath: inkex.CubicSuperPath,
-) -> CompoundGeometricObject:
+) -> CompositeCubicBezier:
     """
     Converts a superpath with a representation
     [Subpath0[handle0_0, point0, handle0_1], ...], ...]
@@ -270,12 +331,14 @@ def convert_to_composite_bezier(
 
     composite_bezier = list()
     for subpath in superpath:
-        bezier_path = list()
-        for (__, p0, p1), (p2, p3, __) in pairwise(subpath):
-            bezier = CubicBezier(Vector(*p0), Vector(*p1), Vector(*p2), Vector(*p3))
-            bezier_path.append(bezier)
-        composite_bezier.append(CompoundGeometricObject(bezier_path))
-    return CompoundGeometricObject(composite_bezier)
+        # Array of shape (m, 3, 2) with [handle_before, point, handle_after]
+        # for each node of the subpath
+        nodes = numpy.array(subpath, dtype=numpy.float64).reshape(-1, 3, 2)
+        control_points = numpy.stack(
+            (nodes[:-1, 1], nodes[:-1, 2], nodes[1:, 0], nodes[1:, 1]), axis=1
+        )
+        composite_bezier.append(CubicBezierPath(control_points))
+    return CompositeCubicBezier(composite_bezier)
 
 
 def get_containing_layer(obj: inkex.BaseElement) -> inkex.Layer:
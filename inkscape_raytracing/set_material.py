@@ -5,7 +5,7 @@ from typing import Final
 
 import inkex
 
-from desc_parser import clear_description
+from desc_parser import clear_description, get_description, set_description
 
 
 class SetMaterial(inkex.Effect):
@@ -22,6 +22,19 @@ class SetMaterial(inkex.Effect):
         inkex.Circle,
     )
 
+    # Elements of the selection that are processed
+    selection_filter: Final = filter_primitives + (inkex.Group,)
+
+    # Name written in the description for each material of the user interface
+    name_alias: Final = {
+        "None": None,
+        "Beam": "beam",
+        "Mirror": "mirror",
+        "Beam dump": "beam_dump",
+        "Beam splitter": "beam_splitter",
+        "Glass": "glass",
+    }
+
     def __init__(self):
         super().__init__()
 
@@ -35,10 +48,22 @@ class SetMaterial(inkex.Effect):
         pars.add_argument("--optical_index", type=float, default=1.5168)
 
     def effect(self) -> None:
-        filter_ = self.filter_primitives + (inkex.Group,)
-        for obj in self.svg.selection.filter(filter_):
+        # The same property is written for all the elements
+        self.optics_field = self.get_optics_field()
+        for obj in self.svg.selection.filter(self.selection_filter):
             self.update_description(obj)
 
+    def get_optics_field(self) -> str:
+        """Text of the chosen optical property, as written in descriptions"""
+
+        material_name = self.name_alias[self.options.optical_material]
+        if material_name is None:
+            return ""
+        optics_field = f"optics:{material_name}"
+        if material_name == "glass":
+            optics_field += f":{self.options.optical_index:.4f}"
+        return optics_field
+
     @singledispatchmethod
     def update_description(self, arg):
         pass
@@ -57,27 +82,14 @@ class SetMaterial(inkex.Effect):
             with the new one.
             """
 
-            desc = obj.desc
+            desc = get_description(obj)
             if desc is None:
                 desc = ""
             new_desc = clear_description(desc)
             if desc != "" and desc[-1] != "\n":
                 desc += "\n"
 
-            name_alias = {
-                "None": None,
-                "Beam": "beam",
-                "Mirror": "mirror",
-                "Beam dump": "beam_dump",
-                "Beam splitter": "beam_splitter",
-                "Glass": "glass",
-            }
-            material_name = name_alias[self.options.optical_material]
-            if material_name is not None:
-                new_desc += f"optics:{material_name}"
-                if material_name == "glass":
-                    new_desc += f":{self.options.optical_index:.4f}"
-            obj.desc = new_desc
+            set_description(obj, new_desc + self.optics_field)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The extensions are run by Inkscape from their own directory and import their
+# modules (raytracing, desc_parser, ...) as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "inkscape_raytracing"))
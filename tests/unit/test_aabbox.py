@@ -1,5 +1,11 @@
-from inkscape_raytracing.raytracing import Vector
-from inkscape_raytracing.raytracing.geometry import AABBox
+import math
+
+from inkscape_raytracing.raytracing import Ray, UnitVector, Vector
+from inkscape_raytracing.raytracing.geometry import (
+    AABBox,
+    CompoundGeometricObject,
+    CubicBezier,
+)
 
 
 def test_englobing_AABBox():
@@ -9,3 +15,24 @@ def test_englobing_AABBox():
     englobing = AABBox.englobing((A0, A1))
     assert englobing == AABBox(Vector(0, 0), Vector(2, 2))
 
+
+def test_compound_AABBox():
+    segments = (
+        CubicBezier(Vector(0, 0), Vector(0, 1), Vector(1, 1), Vector(1, 0)),
+        CubicBezier(Vector(1, 0), Vector(2, -1), Vector(3, 0), Vector(2, 1)),
+    )
+    compound = CompoundGeometricObject(
+        (segments[0], CompoundGeometricObject((segments[1],)))
+    )
+    assert compound.aabbox == AABBox.englobing(seg.aabbox for seg in segments)
+
+
+def test_axis_parallel_ray_AABBox():
+    box = AABBox(Vector(0, 0), Vector(1, 1))
+    ray = Ray(Vector(0.5, -1), UnitVector(0, 1))
+    assert ray.inv_direction == Vector(math.inf, 1)
+    assert box.hit(ray)
+    assert box.entry_distance(ray) == 1
+    ray = Ray(Vector(2, -1), UnitVector(0, 1))
+    assert not box.hit(ray)
+    assert box.entry_distance(ray) == math.inf
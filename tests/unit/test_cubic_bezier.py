@@ -1,7 +1,14 @@
-from math import sqrt
+from math import inf, sqrt
 
-from inkscape_raytracing.raytracing import Vector, UnitVector
-from inkscape_raytracing.raytracing.geometry import CubicBezier
+from pytest import approx
+
+from inkscape_raytracing.raytracing import Ray, Vector, UnitVector
+from inkscape_raytracing.raytracing.geometry import (
+    CompositeCubicBezier,
+    CompoundGeometricObject,
+    CubicBezier,
+    CubicBezierPath,
+)
 
 
 def test_eval():
@@ -19,3 +26,50 @@ def test_tangent():
 def test_normal():
     bez = CubicBezier(Vector(0, 0), Vector(0, 0), Vector(1, 1), Vector(1, 1))
     assert bez.normal(0.5) == UnitVector(-1 / sqrt(2), 1 / sqrt(2))
+
+
+def test_hit_t_max():
+    bez = CubicBezier(Vector(1, -1), Vector(1, -1), Vector(1, 1), Vector(1, 1))
+    ray = Ray(Vector(0, 0), UnitVector(1, 0))
+    assert bez.hit(ray).travel_dist == 1
+    assert bez.hit(ray, t_max=2).travel_dist == 1
+    assert bez.hit(ray, t_max=0.5).travel_dist == inf
+
+
+def test_composite_hit_batched():
+    # Arcs whose control boxes are all crossed by the beam, but only the
+    # last one is hit
+    control_points = [[(i, 1), (i, -1), (i + 1, -1), (i + 1, 1)] for i in range(39)] + [
+        [(39, 1), (39, -1), (40, -1), (40, -1)]
+    ]
+    composite = CompositeCubicBezier([CubicBezierPath(control_points)])
+    ray = Ray(Vector(-1, -0.9), UnitVector(1, 0))
+    assert composite.min_batch_segments <= len(control_points)
+    shade = composite.hit(ray)
+    # Same search without batching the segments
+    looped = CompoundGeometricObject.hit(composite, ray)
+    assert shade.travel_dist == approx(looped.travel_dist)
+    assert 39 < shade.travel_dist - 1 < 40
+    assert shade.hit_geometry is composite
+
+
+def test_aabbox_tight():
+    # The control points extend to y = 2, but the curve only to y = 1.5
+    bez = CubicBezier(Vector(0, 0), Vector(0, 2), Vector(1, 2), Vector(1, 0))
+    box = bez.aabbox
+    assert box.lower_left.x == approx(0, abs=1e-5)
+    assert box.lower_left.y == approx(0, abs=1e-5)
+    assert box.upper_right.x == approx(1, abs=1e-5)
+    assert box.upper_right.y == approx(1.5, abs=1e-5)
+
+
+def test_straight_intersection():
+    straight = CubicBezier(Vector(1, -1), Vector(1, -1), Vector(2, 3), Vector(2, 3))
+    # Same line, but with handles so that it isn't detected as straight
+    curved = CubicBezier(Vector(1, -1), Vector(1.25, 0), Vector(1.75, 2), Vector(2, 3))
+    assert straight.is_straight and not curved.is_straight
+    ray = Ray(Vector(0, 0), UnitVector(1, 0))
+    ((s, t),) = straight.intersection_beam(ray)
+    assert t == approx(1.25)
+    assert straight.eval(s).y == approx(0)
+    assert straight.intersection_beam(Ray(Vector(0, 0), UnitVector(0, 1))) == []
@@ -1,6 +1,10 @@
+import numpy
 from pytest import approx
 
-from inkscape_raytracing.raytracing.geometry.cubic_bezier import cubic_real_roots
+from inkscape_raytracing.raytracing.geometry.cubic_bezier import (
+    cubic_real_roots,
+    cubic_real_roots_many,
+)
 
 
 def test_cubic_real_roots():
@@ -22,3 +26,24 @@ def test_cubic_real_roots():
     assert roots_set(1, 2, 0, 0) == approx({-0.5})
     assert roots_set(1, 0, 0, 0) == set()
     assert roots_set(0, 0, 0, 0) == set()
+
+
+def test_cubic_real_roots_many():
+    coefficients = [
+        (-12, 22, -12, 2),
+        (-0, 1, -2, 1),
+        (1, 2, 0, 1),
+        (0, 0, 0, 1),
+        (-1, 3, -3, 1),
+        # double root at 0.5, not monic
+        (-1.5, 6.75, -9, 3),
+        (-1, 0, 1, 0),
+        (1, 0, 1, 0),
+        (1, 2, 0, 0),
+        (0, 0, 0, 0),
+    ]
+    roots = cubic_real_roots_many(*numpy.array(coefficients).T)
+    assert roots.shape == (len(coefficients), 3)
+    for coefs, many in zip(coefficients, roots):
+        expected = sorted(cubic_real_roots(*coefs))
+        assert sorted(many[~numpy.isnan(many)]) == approx(expected)
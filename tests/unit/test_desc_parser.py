@@ -0,0 +1,11 @@
+from inkscape_raytracing.desc_parser import clear_description, get_optics_fields
+
+
+def test_optics_fields_case():
+    # Characters matched with "i" by the case insensitive pattern, but not
+    # by case folding
+    for desc in ("OPTICS:mirror", "optİcs:mirror", "OPTıCS:mirror"):
+        materials = [field.group("material") for field in get_optics_fields(desc)]
+        assert materials == ["mirror"]
+        assert clear_description(desc) == ""
+    assert list(get_optics_fields("plain déscription")) == []
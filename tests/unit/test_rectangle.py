@@ -0,0 +1,31 @@
+from math import inf
+
+from inkscape_raytracing.raytracing import Ray, Vector, UnitVector
+from inkscape_raytracing.raytracing.geometry import AxisAlignedRectangle
+
+
+def test_hit():
+    rect = AxisAlignedRectangle(Vector(0, 0), Vector(2, 1))
+    shade = rect.hit(Ray(Vector(1, 0.5), UnitVector(1, 0)))
+    assert shade.travel_dist == 1
+    assert shade.local_hit_point == Vector(2, 0.5)
+    assert tuple(shade.normal) == (-1, 0)
+    shade = rect.hit(Ray(Vector(1, -1), UnitVector(0, 1)))
+    assert shade.travel_dist == 1
+    assert tuple(shade.normal) == (0, -1)
+    assert rect.hit(Ray(Vector(1, 0.5), UnitVector(1, 0)), t_max=0.5).travel_dist == inf
+
+
+def test_is_inside():
+    rect = AxisAlignedRectangle(Vector(0, 0), Vector(2, 1))
+    assert rect.is_inside(Ray(Vector(1, 0.5), UnitVector(1, 1)))
+    assert not rect.is_inside(Ray(Vector(-1, 0.5), UnitVector(1, 0)))
+    assert not rect.is_inside(Ray(Vector(3, 0.5), UnitVector(1, 0)))
+
+
+def test_corners_any_order():
+    rect = AxisAlignedRectangle(Vector(2, 0), Vector(0, 1))
+    assert rect.lower_left == Vector(0, 0)
+    assert rect.upper_right == Vector(2, 1)
+    assert rect.is_inside(Ray(Vector(1, 0.5), UnitVector(1, 1)))
+    assert rect.hit(Ray(Vector(1, 0.5), UnitVector(1, 0))).travel_dist == 1
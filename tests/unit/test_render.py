@@ -0,0 +1,63 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from math import cos, sin
+
+# Same module copies as those imported by render.py, see conftest.py
+from raytracing import OpticalObject, Ray, UnitVector, Vector, World
+from raytracing.geometry import CubicBezier
+from raytracing.material import BeamDump, BeamSplitter
+
+from inkscape_raytracing import render
+from inkscape_raytracing.render import BeamSeed, Raytracing
+
+
+def segment(x0, y0, x1, y1):
+    p0, p1 = Vector(x0, y0), Vector(x1, y1)
+    return CubicBezier(p0, p0, p1, p1)
+
+
+def extension_with_seeds():
+    extension = Raytracing()
+    extension.world = World()
+    extension.world.add(OpticalObject(segment(1, -1, 2, 1), BeamSplitter()))
+    for x0, y0, x1, y1 in ((3, -5, 3, 5), (-5, 5, 5, 5), (-5, -5, 5, -5)):
+        extension.world.add(OpticalObject(segment(x0, y0, x1, y1), BeamDump()))
+    seeds = [
+        BeamSeed(Ray(Vector(0, 0), UnitVector(cos(0.1 * k), sin(0.1 * k))))
+        for k in range(-3, 4)
+    ]
+    return extension, seeds
+
+
+def sequential_beams(extension, seeds):
+    return [extension.world.propagate_beams(seed.ray) for seed in seeds]
+
+
+def test_propagate_seeds_parallel(monkeypatch):
+    extension, seeds = extension_with_seeds()
+    monkeypatch.setattr(Raytracing, "min_parallel_seeds", 1)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    beams = [list(generated) for generated in extension.propagate_seeds(seeds)]
+    assert beams == sequential_beams(extension, seeds)
+
+
+def test_propagate_seeds_broken_pool(monkeypatch):
+    class BrokenExecutor:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def map(self, *args):
+            raise BrokenProcessPool
+
+    extension, seeds = extension_with_seeds()
+    monkeypatch.setattr(Raytracing, "min_parallel_seeds", 1)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(render, "ProcessPoolExecutor", BrokenExecutor)
+    beams = [list(generated) for generated in extension.propagate_seeds(seeds)]
+    assert beams == sequential_beams(extension, seeds)
@@ -0,0 +1,10 @@
+import numpy
+
+from inkscape_raytracing.raytracing import Vector, vectors_to_array
+
+
+def test_vectors_to_array():
+    array = vectors_to_array((Vector(0, 1), Vector(2, 3), Vector(4, 5)))
+    assert array.shape == (3, 2)
+    assert numpy.all(array == [[0, 1], [2, 3], [4, 5]])
+    assert vectors_to_array(()).shape == (0, 2)
@@ -0,0 +1,62 @@
+from math import cos, sin
+
+import pytest
+
+from inkscape_raytracing.raytracing import (
+    OpticalObject,
+    Ray,
+    UnitVector,
+    Vector,
+    World,
+)
+from inkscape_raytracing.raytracing.geometry import CubicBezier
+from inkscape_raytracing.raytracing.material import BeamDump, BeamSplitter, Mirror
+
+
+def segment(x0, y0, x1, y1):
+    p0, p1 = Vector(x0, y0), Vector(x1, y1)
+    return CubicBezier(p0, p0, p1, p1)
+
+
+def test_first_hit_bvh():
+    world = World()
+    for i in range(10):
+        world.add(OpticalObject(segment(i, -1 - i, i + 0.5, 1 + i), Mirror()))
+    rays = [
+        Ray(Vector(-1, 0.1 * k), UnitVector(cos(0.1 * k), sin(0.1 * k)))
+        for k in range(-10, 10)
+    ]
+    # Closest collision among all the objects, without the hierarchy
+    expected = [min(obj.geometry.hit(ray).travel_dist for obj in world) for ray in rays]
+
+    assert world.bvh is None
+    assert [world.first_hit(ray)[0].travel_dist for ray in rays] == expected
+    assert world.bvh is not None
+
+    world.add(OpticalObject(segment(-0.5, -1, -0.5, 1), Mirror()))
+    assert world.bvh is None
+
+
+def test_propagate_beams():
+    world = World()
+    world.add(OpticalObject(segment(1, -1, 2, 1), BeamSplitter()))
+    world.add(OpticalObject(segment(3, -5, 3, 5), BeamDump()))
+    world.add(OpticalObject(segment(-5, 2, 5, 2), BeamDump()))
+    world.add(OpticalObject(segment(-5, -2, 5, -2), BeamDump()))
+    beams = world.propagate_beams(Ray(Vector(0, 0), UnitVector(1, 0)))
+    assert len(beams) == 2
+    # reflected beam first, then transmitted beam
+    assert [len(beam) for beam in beams] == [2, 2]
+    assert beams[0][0] is beams[1][0]
+    assert beams[0][0].travel == pytest.approx(1.5)
+    assert beams[1][1].travel == pytest.approx(1.5)
+
+
+def test_propagate_beams_max_depth():
+    world = World(max_recursion_depth=10)
+    world.add(OpticalObject(segment(-1, -1, -1, 1), Mirror()))
+    world.add(OpticalObject(segment(1, -1, 1, 1), Mirror()))
+    with pytest.warns(UserWarning):
+        beams = world.propagate_beams(Ray(Vector(0, 0), UnitVector(1, 0)))
+    assert len(beams) == 1
+    assert len(beams[0]) == 11